@@ -85,7 +85,7 @@ impl App {
         let throttled_sync_tx = throttle_sender(sync_tx.clone(), THROTTLE_SEC);
 
         #[cfg(feature = "electrum")]
-        let electrum = config.electrum_addr().map(|addr| {
+        let electrum = config.electrum_rpc_addr().map(|addr| {
             ElectrumServer::start(
                 addr,
                 iif!(config.electrum_socks_auth, access_token.clone(), None),
@@ -231,7 +231,7 @@ impl App {
 
     #[cfg(feature = "electrum")]
     pub fn electrum_addr(&self) -> Option<net::SocketAddr> {
-        Some(self.electrum.as_ref()?.addr())
+        self.electrum.as_ref()?.addr()
     }
 
     #[cfg(feature = "http")]
@@ -3,6 +3,8 @@ use std::{fs, io, net, path, time};
 use bitcoin::{Address, Network};
 use bitcoincore_rpc::Auth as RpcAuth;
 
+#[cfg(feature = "electrum")]
+use crate::electrum::RpcAddr;
 use crate::error::{Context, OptionExt, Result};
 use crate::query::QueryConfig;
 use crate::types::RescanSince;
@@ -264,6 +266,14 @@ pub struct Config {
     )]
     pub electrum_addr: Option<net::SocketAddr>,
 
+    /// Path to bind the electrum rpc server unix socket (used in place of the TCP listener)
+    #[cfg(all(unix, feature = "electrum"))]
+    #[cfg_attr(
+        feature = "cli",
+        structopt(short = "E", long, env, hide_env_values(true), display_order(44))
+    )]
+    pub electrum_unix_listener_path: Option<path::PathBuf>,
+
     /// Skip generating merkle proofs. Reduces resource usage, requires running Electrum with --skipmerklecheck. [env: ELECTRUM_SKIP_MERKLE]
     #[cfg(feature = "electrum")]
     #[cfg_attr(feature = "cli", structopt(long, short = "M", display_order(1006)))]
@@ -459,6 +469,17 @@ impl Config {
         })
     }
 
+    /// Get the address for the Electrum RPC server to listen on, preferring
+    /// the unix socket listener when one is configured
+    #[cfg(feature = "electrum")]
+    pub fn electrum_rpc_addr(&self) -> Option<RpcAddr> {
+        #[cfg(unix)]
+        if let Some(path) = &self.electrum_unix_listener_path {
+            return Some(RpcAddr::Unix(path.clone()));
+        }
+        self.electrum_addr().map(RpcAddr::Tcp)
+    }
+
     #[cfg(feature = "http")]
     pub fn http_addr(&self) -> Option<net::SocketAddr> {
         self.http_addr.clone().or_else(|| {
@@ -730,6 +751,7 @@ defaultable!(Config,
     bitcoind_wallet, bitcoind_dir, bitcoind_url, bitcoind_auth, bitcoind_cookie, create_wallet_if_missing,
     auth_cookie, auth_token, auth_ephemeral, print_token,
     #[cfg(feature = "electrum")] electrum_addr,
+    #[cfg(all(unix, feature = "electrum"))] electrum_unix_listener_path,
     #[cfg(feature = "electrum")] electrum_skip_merkle,
     #[cfg(feature = "electrum")] electrum_socks_auth,
     #[cfg(feature = "http")] http_addr,
@@ -7,7 +7,7 @@ use crate::types::{MempoolEntry, ScriptHash, StatusHash, TxStatus};
 use crate::util::BoolThen;
 
 mod server;
-pub use server::ElectrumServer;
+pub use server::{ElectrumServer, RpcAddr, RpcStream};
 
 pub fn electrum_height(status: TxStatus, has_unconfirmed_parents: Option<bool>) -> i32 {
     match status {
@@ -1,10 +1,17 @@
 use std::cmp;
 use std::collections::{HashMap, HashSet};
-use std::io::{BufRead, BufReader, Write};
+use std::io::{self, BufRead, BufReader, Read, Write};
 use std::net::{Shutdown, SocketAddr, TcpListener, TcpStream};
 use std::sync::mpsc::{channel, sync_channel, Receiver, Sender, SyncSender, TrySendError};
 use std::sync::{Arc, Mutex};
-use std::{thread, time};
+use std::{fmt, thread, time};
+
+#[cfg(unix)]
+use std::os::unix::fs::FileTypeExt;
+#[cfg(unix)]
+use std::os::unix::net::{UnixListener, UnixStream};
+#[cfg(unix)]
+use std::{fs, path::PathBuf};
 
 use bitcoin::Txid;
 use bitcoin_hashes::hex::ToHex;
@@ -30,8 +37,8 @@ const LT: &str = "bwt::electrum"; // log target name
 struct Connection {
     query: Arc<Query>,
     skip_merkle: bool,
-    stream: TcpStream,
-    addr: SocketAddr,
+    stream: RpcStream,
+    addr: String,
     chan: SyncChannel<Message>,
     subman: Arc<Mutex<SubscriptionManager>>,
     subscriber_id: usize,
@@ -41,8 +48,8 @@ impl Connection {
     pub fn new(
         query: Arc<Query>,
         skip_merkle: bool,
-        stream: TcpStream,
-        addr: SocketAddr,
+        stream: RpcStream,
+        addr: String,
         subman: Arc<Mutex<SubscriptionManager>>,
     ) -> Connection {
         let chan = SyncChannel::new(10);
@@ -372,46 +379,77 @@ impl Connection {
     }
 
     fn send_values(&mut self, values: &[Value]) -> Result<()> {
+        // serialize all the values into a single buffer, so that bursts of messages
+        // are coalesced into a single write() call
+        let mut buf = Vec::new();
         for value in values {
-            let line = value.to_string() + "\n";
-            self.stream
-                .write_all(line.as_bytes())
-                .context(format!("failed to send {}", value))?;
+            serde_json::to_writer(&mut buf, value).context("failed to serialize message")?;
+            buf.push(b'\n');
         }
+        self.stream
+            .write_all(&buf)
+            .with_context(|| format!("failed to send {:?}", values))?;
         Ok(())
     }
 
     fn handle_replies(&mut self) -> Result<()> {
         loop {
-            let msg = self.chan.receiver().recv().context("channel closed")?;
-            match msg {
-                Message::Request(line) => {
-                    let mut cmd: Value = from_str(&line).context("invalid JSON format")?;
-                    let reply = match (cmd["method"].take(), cmd["params"].take(), cmd["id"].take())
-                    {
-                        (Value::String(method), params, id) => {
-                            self.handle_command(&method, params, id)?
-                        }
-                        _ => bail!("invalid command: {}", line),
-                    };
-                    self.send_values(&[reply])?
-                }
-                Message::ChainTip(..) | Message::HistoryChange(..) => {
-                    let (method, params) = self.make_notification(msg)?;
-                    debug!(target: LT, "sending notification {} {}", method, params);
-                    self.send_values(&[json!({
-                        "jsonrpc": "2.0",
-                        "method": method,
-                        "params": params
-                    })])?;
+            // block until a message arrives, then drain any additionally pending ones,
+            // so that bursts (e.g. the notifications sent after a new block) are
+            // processed as a single batch and sent out with a single write
+            let mut msgs = vec![self.chan.receiver().recv().context("channel closed")?];
+            while let Ok(msg) = self.chan.receiver().try_recv() {
+                msgs.push(msg);
+            }
+
+            let mut values = Vec::with_capacity(msgs.len());
+            for msg in msgs {
+                match self.process_msg(msg, &mut values) {
+                    Ok(false) => (),
+                    // flush whatever was already batched before shutting down
+                    Ok(true) => return self.send_values(&values),
+                    // likewise before disconnecting on a failed message, so that replies to
+                    // requests that preceded it in the batch still get delivered
+                    Err(err) => {
+                        self.send_values(&values).ok();
+                        return Err(err);
+                    }
                 }
-                Message::Done => return Ok(()),
             }
+            self.send_values(&values)?;
         }
     }
 
+    // process a single message, appending the value(s) to be sent back to the client.
+    // returns true when a Done message is received.
+    fn process_msg(&mut self, msg: Message, values: &mut Vec<Value>) -> Result<bool> {
+        match msg {
+            Message::Request(line) => {
+                let mut cmd: Value = from_str(&line).context("invalid JSON format")?;
+                let reply = match (cmd["method"].take(), cmd["params"].take(), cmd["id"].take()) {
+                    (Value::String(method), params, id) => {
+                        self.handle_command(&method, params, id)?
+                    }
+                    _ => bail!("invalid command: {}", line),
+                };
+                values.push(reply);
+            }
+            Message::ChainTip(..) | Message::HistoryChange(..) => {
+                let (method, params) = self.make_notification(msg)?;
+                debug!(target: LT, "sending notification {} {}", method, params);
+                values.push(json!({
+                    "jsonrpc": "2.0",
+                    "method": method,
+                    "params": params
+                }));
+            }
+            Message::Done => return Ok(true),
+        }
+        Ok(false)
+    }
+
     fn handle_requests(
-        mut stream: TcpStream,
+        mut stream: RpcStream,
         access_token: Option<&str>,
         tx: SyncSender<Message>,
     ) -> Result<()> {
@@ -426,8 +464,10 @@ impl Connection {
         }
 
         let mut reader = BufReader::new(stream);
+        // the line buffer is reused across requests to avoid re-allocating it for every line
+        let mut line = Vec::<u8>::new();
         loop {
-            let mut line = Vec::<u8>::new();
+            line.clear();
             reader
                 .read_until(b'\n', &mut line)
                 .context("failed to read a request")?;
@@ -440,8 +480,10 @@ impl Connection {
                     let _ = tx.send(Message::Done);
                     bail!("invalid request - maybe SSL-encrypted data?: {:?}", line)
                 }
-                match String::from_utf8(line) {
-                    Ok(req) => tx.send(Message::Request(req)).context("channel closed")?,
+                match std::str::from_utf8(&line) {
+                    Ok(req) => tx
+                        .send(Message::Request(req.to_owned()))
+                        .context("channel closed")?,
                     Err(err) => {
                         let _ = tx.send(Message::Done);
                         bail!("invalid UTF8: {}", err)
@@ -453,7 +495,7 @@ impl Connection {
 
     pub fn run(mut self, access_token: Arc<Option<String>>) {
         let tx = self.chan.sender();
-        let stream = self.stream.try_clone().expect("failed to clone TcpStream");
+        let stream = self.stream.try_clone().expect("failed to clone stream");
         let child = spawn_thread("reader", move || {
             Connection::handle_requests(stream, access_token.as_deref(), tx)
         });
@@ -497,9 +539,148 @@ pub enum Notification {
     Exit,
 }
 
+/// An address for the Electrum RPC server to listen on, either TCP or a unix socket
+#[derive(Clone, Debug)]
+pub enum RpcAddr {
+    Tcp(SocketAddr),
+    #[cfg(unix)]
+    Unix(PathBuf),
+}
+
+impl fmt::Display for RpcAddr {
+    fn fmt(&self, f: &mut fmt::Formatter) -> fmt::Result {
+        match self {
+            RpcAddr::Tcp(addr) => addr.fmt(f),
+            #[cfg(unix)]
+            RpcAddr::Unix(path) => path.display().fmt(f),
+        }
+    }
+}
+
+enum RpcListener {
+    Tcp(TcpListener),
+    #[cfg(unix)]
+    Unix(UnixListener),
+}
+
+impl RpcListener {
+    /// Bind the listener, returning it along with the actual bound address
+    /// (which may differ from the requested one when binding TCP port 0)
+    fn bind(addr: &RpcAddr) -> (Self, RpcAddr) {
+        match addr {
+            RpcAddr::Tcp(addr) => {
+                let listener = TcpListener::bind(addr)
+                    .with_context(|| format!("bind({}) failed", addr))
+                    .unwrap(); // TODO don't panic
+                let bound_addr = listener.local_addr().unwrap();
+                (RpcListener::Tcp(listener), RpcAddr::Tcp(bound_addr))
+            }
+            #[cfg(unix)]
+            RpcAddr::Unix(path) => {
+                // cleanup socket file from previous run (should ideally happen on shutdown)
+                if let Ok(meta) = fs::metadata(path) {
+                    if meta.file_type().is_socket() {
+                        fs::remove_file(path).unwrap();
+                    }
+                }
+                let listener = UnixListener::bind(path)
+                    .with_context(|| format!("bind({}) failed", path.display()))
+                    .unwrap(); // TODO don't panic
+                (RpcListener::Unix(listener), RpcAddr::Unix(path.clone()))
+            }
+        }
+    }
+
+    // Accept a connection, returning the peer address for TCP connections
+    // (unix socket peers are typically unnamed)
+    fn accept(&self) -> io::Result<(RpcStream, Option<SocketAddr>)> {
+        Ok(match self {
+            RpcListener::Tcp(listener) => {
+                let (stream, addr) = listener.accept()?;
+                (RpcStream::Tcp(stream), Some(addr))
+            }
+            #[cfg(unix)]
+            RpcListener::Unix(listener) => {
+                let (stream, _) = listener.accept()?;
+                (RpcStream::Unix(stream), None)
+            }
+        })
+    }
+}
+
+/// A connection to an Electrum RPC client, over TCP or a unix socket
+pub enum RpcStream {
+    Tcp(TcpStream),
+    #[cfg(unix)]
+    Unix(UnixStream),
+}
+
+impl RpcStream {
+    pub fn try_clone(&self) -> io::Result<Self> {
+        Ok(match self {
+            RpcStream::Tcp(stream) => RpcStream::Tcp(stream.try_clone()?),
+            #[cfg(unix)]
+            RpcStream::Unix(stream) => RpcStream::Unix(stream.try_clone()?),
+        })
+    }
+
+    pub fn shutdown(&self, how: Shutdown) -> io::Result<()> {
+        match self {
+            RpcStream::Tcp(stream) => stream.shutdown(how),
+            #[cfg(unix)]
+            RpcStream::Unix(stream) => stream.shutdown(how),
+        }
+    }
+
+    fn set_nonblocking(&self, nonblocking: bool) -> io::Result<()> {
+        match self {
+            RpcStream::Tcp(stream) => stream.set_nonblocking(nonblocking),
+            #[cfg(unix)]
+            RpcStream::Unix(stream) => stream.set_nonblocking(nonblocking),
+        }
+    }
+
+    fn set_nodelay(&self, nodelay: bool) -> io::Result<()> {
+        match self {
+            RpcStream::Tcp(stream) => stream.set_nodelay(nodelay),
+            // not applicable to unix sockets
+            #[cfg(unix)]
+            RpcStream::Unix(_) => Ok(()),
+        }
+    }
+}
+
+impl Read for RpcStream {
+    fn read(&mut self, buf: &mut [u8]) -> io::Result<usize> {
+        match self {
+            RpcStream::Tcp(stream) => stream.read(buf),
+            #[cfg(unix)]
+            RpcStream::Unix(stream) => stream.read(buf),
+        }
+    }
+}
+
+impl Write for RpcStream {
+    fn write(&mut self, buf: &[u8]) -> io::Result<usize> {
+        match self {
+            RpcStream::Tcp(stream) => stream.write(buf),
+            #[cfg(unix)]
+            RpcStream::Unix(stream) => stream.write(buf),
+        }
+    }
+
+    fn flush(&mut self) -> io::Result<()> {
+        match self {
+            RpcStream::Tcp(stream) => stream.flush(),
+            #[cfg(unix)]
+            RpcStream::Unix(stream) => stream.flush(),
+        }
+    }
+}
+
 pub struct ElectrumServer {
     notification: Sender<Notification>,
-    addr: SocketAddr,
+    addr: RpcAddr,
     server: Option<thread::JoinHandle<()>>, // so we can join the server while dropping this ojbect
 }
 
@@ -507,7 +688,7 @@ impl ElectrumServer {
     fn start_notifier(
         notification: Channel<Notification>,
         subman: Arc<Mutex<SubscriptionManager>>,
-        acceptor: Sender<Option<(TcpStream, SocketAddr)>>,
+        acceptor: Sender<Option<(RpcStream, String)>>,
     ) {
         spawn_thread("notification", move || {
             for msg in notification.receiver().iter() {
@@ -523,33 +704,40 @@ impl ElectrumServer {
         });
     }
 
-    fn start_acceptor(addr: SocketAddr) -> (SocketAddr, Channel<Option<(TcpStream, SocketAddr)>>) {
-        let listener = TcpListener::bind(addr)
-            .with_context(|| format!("bind({}) failed", addr))
-            .unwrap(); // TODO don't panic
-        let bound_addr = listener.local_addr().unwrap();
+    fn start_acceptor(addr: RpcAddr) -> (RpcAddr, Channel<Option<(RpcStream, String)>>) {
+        let (listener, bound_addr) = RpcListener::bind(&addr);
         info!(
             target: LT,
-            "Electrum RPC server running on {}:t (protocol {})", bound_addr, PROTOCOL_VERSION
+            "Electrum RPC server running on {} (protocol {})", bound_addr, PROTOCOL_VERSION
         );
 
         let chan = Channel::unbounded();
         let acceptor = chan.sender();
-        spawn_thread("acceptor", move || loop {
-            let (stream, addr) = listener.accept().expect("accept failed");
-            stream
-                .set_nonblocking(false)
-                .expect("failed to set connection as blocking");
-            if acceptor.send(Some((stream, addr))).is_err() {
-                trace!(target: LT, "acceptor shutting down");
-                break;
+        spawn_thread("acceptor", move || {
+            let mut peer_seq = 0usize;
+            loop {
+                let (stream, addr) = listener.accept().expect("accept failed");
+                peer_seq += 1;
+                // tag unnamed unix socket peers with a sequential id instead of an address
+                let addr = addr.map_or_else(|| format!("unix#{}", peer_seq), |a| a.to_string());
+                stream
+                    .set_nonblocking(false)
+                    .expect("failed to set connection as blocking");
+                // Disable Nagle's algorithm. The RPC protocol is made of small request/reply
+                // messages that should be sent out immediately, delaying them only adds
+                // latency to each call.
+                stream.set_nodelay(true).expect("failed to set TCP_NODELAY");
+                if acceptor.send(Some((stream, addr))).is_err() {
+                    trace!(target: LT, "acceptor shutting down");
+                    break;
+                }
             }
         });
         (bound_addr, chan)
     }
 
     pub fn start(
-        addr: SocketAddr,
+        addr: RpcAddr,
         access_token: Option<String>,
         skip_merkle: bool,
         query: Arc<Query>,
@@ -578,7 +766,8 @@ impl ElectrumServer {
 
                     let thandle = spawn_thread("peer", move || {
                         info!(target: LT, "[{}] connected peer", addr);
-                        let conn = Connection::new(query, skip_merkle, stream, addr, subman);
+                        let conn =
+                            Connection::new(query, skip_merkle, stream, addr.clone(), subman);
                         conn.run(access_token);
                         info!(target: LT, "[{}] disconnected peer", addr);
                         threads_.lock().unwrap().remove(&thread::current().id());
@@ -636,8 +825,13 @@ impl ElectrumServer {
         }
     }
 
-    pub fn addr(&self) -> SocketAddr {
-        self.addr
+    /// Get the address the TCP listener is bound on, if one is in use
+    pub fn addr(&self) -> Option<SocketAddr> {
+        match self.addr {
+            RpcAddr::Tcp(addr) => Some(addr),
+            #[cfg(unix)]
+            RpcAddr::Unix(_) => None,
+        }
     }
 }
 
@@ -651,7 +845,15 @@ impl Drop for ElectrumServer {
         trace!(target: LT, "RPC server is stopped");
         // Initiate one final connection to the Electrum server to make the acceptor thread notice the channel is closed and shut down.
         // A hack, to be replaced with concurrent multi-channel signal processing (which cannot easily be done with the std lib)
-        TcpStream::connect_timeout(&self.addr, time::Duration::from_millis(200)).ok();
+        match &self.addr {
+            RpcAddr::Tcp(addr) => {
+                TcpStream::connect_timeout(addr, time::Duration::from_millis(200)).ok();
+            }
+            #[cfg(unix)]
+            RpcAddr::Unix(path) => {
+                UnixStream::connect(path).ok();
+            }
+        }
     }
 }
 
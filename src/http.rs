@@ -11,9 +11,11 @@ use bitcoin::{Address, BlockHash, OutPoint, Txid};
 use bitcoin_hashes::hex::{FromHex, ToHex};
 
 use crate::error::{fmt_error_chain, BwtError, Error, OptionExt};
-use crate::types::{BlockId, ScriptHash};
+use crate::types::{BlockId, RescanSince, ScriptHash};
 use crate::util::auth::http_basic_auth;
-use crate::util::{banner, block_on_future, descriptor::Checksum, whitepaper};
+use crate::util::descriptor::{Checksum, ExtendedDescriptor};
+use crate::util::xpub::XyzPubKey;
+use crate::util::{banner, block_on_future, whitepaper};
 use crate::{store, IndexChange, Query};
 
 type SyncChanSender = Arc<Mutex<mpsc::Sender<()>>>;
@@ -97,6 +99,31 @@ fn setup(
         })
         .map(handle_error);
 
+    // POST /wallets
+    let add_wallet_handler = warp::post()
+        .and(warp::path!("wallets"))
+        .and(warp::body::json())
+        .and(query.clone())
+        .and(sync_tx.clone())
+        .map(
+            |body: AddWalletBody, query: Arc<Query>, sync_tx: SyncChanSender| {
+                let mut checksums = vec![];
+                for desc in body.descriptors {
+                    checksums.push(query.add_wallet_descriptor(desc, body.rescan_since)?);
+                }
+                for xpub in body.xpubs {
+                    checksums.append(&mut query.add_wallet_xpub(xpub, body.rescan_since)?);
+                }
+                // trigger an immediate sync to import the new wallets
+                sync_tx.lock().unwrap().send(())?;
+                Ok(reply::with_status(
+                    reply::json(&checksums),
+                    StatusCode::ACCEPTED,
+                ))
+            },
+        )
+        .map(handle_error);
+
     // GET /scripthash/:scripthash/*
     let scripthash_route = warp::path!("scripthash" / ScriptHash / ..);
 
@@ -451,6 +478,7 @@ fn setup(
         wallet_key_handler, // needs to be before spk_handler to work with keys that don't have any indexed history
         wallet_gap_handler,
         wallet_next_handler,
+        add_wallet_handler,
         spk_handler,
         spk_utxo_handler,
         spk_stats_handler,
@@ -724,6 +752,15 @@ struct BroadcastBody {
     tx_hex: String,
 }
 
+#[derive(Deserialize, Debug)]
+struct AddWalletBody {
+    #[serde(default)]
+    descriptors: Vec<ExtendedDescriptor>,
+    #[serde(default)]
+    xpubs: Vec<XyzPubKey>,
+    rescan_since: Option<RescanSince>,
+}
+
 fn compact_history(tx_hist: &store::HistoryEntry) -> serde_json::Value {
     json!([tx_hist.txid, tx_hist.status])
 }
@@ -12,7 +12,9 @@ use crate::error::Result;
 use crate::store::{FundingInfo, MemoryStore, SpendingInfo, TxEntry};
 use crate::types::{BlockId, InPoint, RescanSince, ScriptHash, TxStatus};
 use crate::util::bitcoincore_ext::{ListTransactionResult, RpcApiExt};
+use crate::util::descriptor::{Checksum, ExtendedDescriptor};
 use crate::util::progress::Progress;
+use crate::util::xpub::XyzPubKey;
 use crate::wallet::{KeyOrigin, WalletWatcher};
 
 pub struct Indexer {
@@ -107,6 +109,17 @@ impl Indexer {
             }
         }
 
+        // import wallets/addresses that were added at runtime and are pending a rescan.
+        // the transactions discovered by the rescan won't show up in the incremental
+        // `listsinceblock` results, so the history is re-synced from scratch (without
+        // collecting additional changelog events, similarly to reorgs)
+        if self.watcher.has_pending_rescan_imports() {
+            info!("found pending rescan imports, importing and re-syncing history from scratch...");
+            self.watcher.do_imports(&self.rpc, /*rescan=*/ false)?;
+            changelog.track = false;
+            self.tip = None;
+        }
+
         let synced_tip = self.sync_transactions(false, &mut changelog)?;
         let tip_updated = self.tip != Some(synced_tip);
         self.sync_mempool(/*force_refresh=*/ tip_updated);
@@ -399,6 +412,22 @@ impl Indexer {
     pub fn track_address(&mut self, address: Address, rescan_since: RescanSince) -> Result<()> {
         self.watcher.track_address(address, rescan_since)
     }
+
+    pub fn add_descriptor(
+        &mut self,
+        desc: ExtendedDescriptor,
+        rescan_since: Option<RescanSince>,
+    ) -> Result<Checksum> {
+        self.watcher.add_descriptor(desc, rescan_since)
+    }
+
+    pub fn add_xpub(
+        &mut self,
+        xpub: XyzPubKey,
+        rescan_since: Option<RescanSince>,
+    ) -> Result<Vec<Checksum>> {
+        self.watcher.add_xpub(xpub, rescan_since)
+    }
 }
 
 #[derive(Clone, Serialize, Debug)]
@@ -13,8 +13,9 @@ use bitcoincore_rpc::{json as rpcjson, Client as RpcClient, RpcApi};
 use crate::error::{BwtError, Context, OptionExt, Result};
 use crate::indexer::{IndexChange, Indexer};
 use crate::store::{FundingInfo, HistoryEntry, ScriptInfo, SpendingInfo, TxEntry};
-use crate::types::{BlockId, MempoolEntry, ScriptHash, TxStatus};
-use crate::util::descriptor::Checksum;
+use crate::types::{BlockId, MempoolEntry, RescanSince, ScriptHash, TxStatus};
+use crate::util::descriptor::{Checksum, ExtendedDescriptor};
+use crate::util::xpub::XyzPubKey;
 use crate::util::{make_fee_histogram, BoolThen};
 use crate::wallet::{KeyOrigin, Wallet};
 
@@ -510,6 +511,27 @@ impl Query {
         let wallet = indexer.watcher().get(checksum)?;
         wallet.find_gap(indexer.store())
     }
+
+    // add a descriptor wallet to be tracked, imported on the next sync run
+    pub fn add_wallet_descriptor(
+        &self,
+        desc: ExtendedDescriptor,
+        rescan_since: Option<RescanSince>,
+    ) -> Result<Checksum> {
+        self.indexer
+            .write()
+            .unwrap()
+            .add_descriptor(desc, rescan_since)
+    }
+
+    // add an xpub to be tracked (as two separate external/internal chain wallets)
+    pub fn add_wallet_xpub(
+        &self,
+        xpub: XyzPubKey,
+        rescan_since: Option<RescanSince>,
+    ) -> Result<Vec<Checksum>> {
+        self.indexer.write().unwrap().add_xpub(xpub, rescan_since)
+    }
 }
 
 // Attach descriptor and bip32 origin information when available
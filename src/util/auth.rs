@@ -1,8 +1,11 @@
 use rand::Rng;
-use std::{fs, io, net, path};
+use std::{fs, io, path};
 
 use crate::error::Error;
 
+#[cfg(feature = "electrum")]
+use crate::electrum::RpcStream;
+
 const GEN_CHARSET: &[u8] = b"abcdefghijklmnopqrstuvwxyz0123456789";
 const GEN_LENGTH: usize = 25;
 const LT: &str = "bwt::auth";
@@ -65,10 +68,7 @@ fn read_write_cookie(file: &path::Path) -> Result<String, io::Error> {
 /// For clients that support setting a SOCKS5 proxy but not a password for it, the token can also
 /// be provided as the destination hostname.
 #[cfg(feature = "electrum")]
-pub fn electrum_socks5_auth(
-    mut stream: net::TcpStream,
-    access_token: &str,
-) -> Result<net::TcpStream, Error> {
+pub fn electrum_socks5_auth(mut stream: RpcStream, access_token: &str) -> Result<RpcStream, Error> {
     use std::io::{BufReader, Read, Write};
 
     const SOCKS5: u8 = 0x05;
@@ -96,7 +96,7 @@ pub fn electrum_socks5_auth(
         Ok(buf)
     };
 
-    let mut reader = BufReader::new(stream.try_clone().expect("failed to clone TcpStream"));
+    let mut reader = BufReader::new(stream.try_clone().expect("failed to clone stream"));
 
     // Client greeting: VER=0x05, <AUTH_LEN><AUTH_METHODS>
     ensure!(read_byte(&mut reader)? == SOCKS5, "invalid version");
@@ -146,7 +146,7 @@ pub fn electrum_socks5_auth(
         SOCKS5, SUCCESS, RSV, ADDR_IPV4, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
     ])?;
 
-    // Hand the TCP socket back to the Electrum server
+    // Hand the socket back to the Electrum server
     Ok(stream)
 }
 
@@ -26,6 +26,10 @@ pub struct WalletWatcher {
     pending_standalone: Vec<AddressImport>,
     /// Force rescan on the first run
     force_rescan: bool,
+    /// Default settings for wallets added at runtime
+    gap_limit: u32,
+    initial_import_size: u32,
+    rescan_since: RescanSince,
 }
 
 type AddressImport = (Address, RescanSince);
@@ -60,6 +64,10 @@ impl WalletWatcher {
             wallets,
             pending_standalone: addresses,
             force_rescan,
+            // the standard defaults, overridden by from_config() with the user's settings
+            gap_limit: 20,
+            initial_import_size: 350,
+            rescan_since: RescanSince::Now,
         })
     }
 
@@ -106,7 +114,11 @@ impl WalletWatcher {
             }
         }
 
-        Self::new(config.network, wallets, addresses, config.force_rescan)
+        let mut watcher = Self::new(config.network, wallets, addresses, config.force_rescan)?;
+        watcher.gap_limit = config.gap_limit;
+        watcher.initial_import_size = config.initial_import_size;
+        watcher.rescan_since = config.rescan_since;
+        Ok(watcher)
     }
 
     pub fn wallets(&self) -> &HashMap<Checksum, Wallet> {
@@ -183,12 +195,18 @@ impl WalletWatcher {
 
         for (_, wallet) in self.wallets.iter_mut() {
             if self.force_rescan || wallet.needs_imports() {
+                // wallets still pending their initial rescan import (e.g. wallets added
+                // at runtime between regular sync runs) always get imported with a rescan
+                let rescan = rescan || wallet.rescan_pending;
                 let start_index = iif!(self.force_rescan, 0, wallet.import_start_index());
                 let end_index = wallet.import_end_index(rescan);
 
                 import_reqs.append(&mut wallet.make_imports(start_index, end_index, rescan));
 
                 pending_updates.push((wallet, end_index));
+            } else {
+                // fully imported up to the gap limit, the initial rescan is complete
+                wallet.rescan_pending = false;
             }
         }
 
@@ -226,6 +244,65 @@ impl WalletWatcher {
         Ok(has_imports)
     }
 
+    /// Check whether any wallets or standalone addresses are pending an initial rescan
+    /// import, which requires re-syncing their historical transactions
+    pub fn has_pending_rescan_imports(&self) -> bool {
+        self.wallets
+            .values()
+            .any(|wallet| wallet.rescan_pending && wallet.needs_imports())
+            || self
+                .pending_standalone
+                .iter()
+                .any(|(_, rescan_since)| *rescan_since != RescanSince::Now)
+    }
+
+    /// Add a descriptor wallet to be tracked
+    ///
+    /// The wallet's addresses will get imported on the next sync run. Adding an already
+    /// tracked descriptor is a no-op. Returns the checksum identifying the wallet.
+    pub fn add_descriptor(
+        &mut self,
+        desc: ExtendedDescriptor,
+        rescan_since: Option<RescanSince>,
+    ) -> Result<Checksum> {
+        let wallet = Wallet::from_descriptor(
+            desc,
+            self.network,
+            self.gap_limit,
+            self.initial_import_size,
+            rescan_since.unwrap_or(self.rescan_since),
+        )?;
+        let checksum = wallet.checksum.clone();
+        self.wallets.entry(checksum.clone()).or_insert(wallet);
+        Ok(checksum)
+    }
+
+    /// Add an xpub to be tracked (as separate external/internal chain wallets)
+    ///
+    /// The wallets' addresses will get imported on the next sync run.
+    /// Returns the checksums identifying the two wallets.
+    pub fn add_xpub(
+        &mut self,
+        xpub: XyzPubKey,
+        rescan_since: Option<RescanSince>,
+    ) -> Result<Vec<Checksum>> {
+        let wallets = Wallet::from_xpub(
+            xpub,
+            self.network,
+            self.gap_limit,
+            self.initial_import_size,
+            rescan_since.unwrap_or(self.rescan_since),
+        )?;
+        Ok(wallets
+            .into_iter()
+            .map(|wallet| {
+                let checksum = wallet.checksum.clone();
+                self.wallets.entry(checksum.clone()).or_insert(wallet);
+                checksum
+            })
+            .collect())
+    }
+
     /// Add an address to be tracked
     ///
     /// The address will be added to the list of pending imports and will get imported on the next sync run.
@@ -253,6 +330,7 @@ pub struct Wallet {
 
     max_funded_index: Option<u32>,
     max_imported_index: Option<u32>,
+    rescan_pending: bool,
 }
 
 impl Wallet {
@@ -285,6 +363,8 @@ impl Wallet {
             rescan_since,
             max_funded_index: None,
             max_imported_index: None,
+            // cleared once the wallet is fully imported up to its gap limit
+            rescan_pending: true,
         })
     }
 